@@ -3,18 +3,24 @@ Network connector for Coingecko.
 """
 # pylint: disable=redefined-outer-name
 import asyncio
+import os
+from contextlib import suppress
 from datetime import datetime, timedelta, timezone
+from hashlib import sha1
 
 import numpy as np
 import pandas as pd
 
 from curvesim.utils import get_pairs
 from curvesim.exceptions import HttpClientError
+from curvesim.logging import get_logger
 
 from tenacity import RetryError
 from .http import HTTP
 from .utils import sync
 
+logger = get_logger(__name__)
+
 URL = "https://api.coingecko.com/api/v3/"
 
 PLATFORMS = {
@@ -28,18 +34,39 @@ PLATFORMS = {
     "matic:": "polygon-pos",
 }
 
+# Requests in flight at once; CoinGecko rate-limits bursts
+MAX_CONCURRENT_REQUESTS = 10
+
+# Price data for ranges wholly in the past never changes, so it is kept here
+CACHE_DIR = os.path.join(os.path.expanduser("~"), ".curvesim", "coingecko")
+
+# Seconds before a range's end is final; CoinGecko revises its latest points
+CACHE_MIN_AGE = 86400
+
+# Seconds a cache file is kept.  Only identical date ranges hit the cache, and
+# the default range moves daily, so old files would otherwise pile up.
+CACHE_MAX_AGE = 86400 * 30
+
+
+async def _get(url, params=None, semaphore=None):
+    semaphore = semaphore or asyncio.Semaphore(MAX_CONCURRENT_REQUESTS)
+    async with semaphore:
+        r = await HTTP.get(url, params=params)
+
+    return r
+
 
-async def _get_prices(coin_id, vs_currency, start, end):
+async def _get_prices(coin_id, vs_currency, start, end, semaphore=None):
     url = URL + f"coins/{coin_id}/market_chart/range"
     p = {"vs_currency": vs_currency, "from": start, "to": end}
 
-    r = await HTTP.get(url, params=p)
+    r = await _get(url, params=p, semaphore=semaphore)
 
     return r
 
 
-async def get_prices(coin_id, vs_currency, start, end):
-    r = await _get_prices(coin_id, vs_currency, start, end)
+async def get_prices(coin_id, vs_currency, start, end, semaphore=None):
+    r = await _get_prices(coin_id, vs_currency, start, end, semaphore=semaphore)
 
     # Format data
     data = pd.DataFrame(r["prices"], columns=["timestamp", "prices"])
@@ -52,7 +79,75 @@ async def get_prices(coin_id, vs_currency, start, end):
     return data
 
 
-async def _pool_prices(coins, vs_currency, days, end=None):
+def _cache_path(coin, chain, vs_currency, start, end):
+    key = f"{coin.lower()}-{chain.lower()}-{vs_currency.lower()}-{start}-{end}"
+    return os.path.join(CACHE_DIR, sha1(key.encode()).hexdigest() + ".pkl")
+
+
+def _read_cache(path):
+    """Returns the cached data, or None if it is missing or unreadable."""
+    if not os.path.exists(path):
+        return None
+
+    try:
+        return pd.read_pickle(path)
+    except Exception:  # pylint: disable=broad-except
+        # e.g., a pickle written by an incompatible pandas version
+        logger.warning("Ignoring unreadable cache file %s", path, exc_info=True)
+        return None
+
+
+def _write_cache(data, path):
+    """Writes data to the cache; failures are logged, not raised."""
+    tmp_path = f"{path}.{os.getpid()}.tmp"
+    try:
+        os.makedirs(CACHE_DIR, exist_ok=True)
+        _prune_cache()
+        data.to_pickle(tmp_path)
+        os.replace(tmp_path, path)  # atomic, so readers never see partial files
+    except OSError:
+        logger.warning("Could not write cache file %s", path, exc_info=True)
+        with suppress(OSError):
+            os.remove(tmp_path)
+
+
+def _prune_cache():
+    """Removes cache files last written more than `CACHE_MAX_AGE` ago."""
+    cutoff = datetime.now(timezone.utc).timestamp() - CACHE_MAX_AGE
+    with os.scandir(CACHE_DIR) as entries:
+        for entry in entries:
+            # Another process may remove the same file
+            with suppress(OSError):
+                if entry.stat().st_mtime < cutoff:
+                    os.remove(entry.path)
+
+
+async def _get_coin_prices(  # pylint: disable=too-many-arguments
+    address, symbol, chain, vs_currency, start, end, semaphore, force_refresh=False
+):
+    coin = address or symbol
+    cacheable = end <= datetime.now(timezone.utc).timestamp() - CACHE_MIN_AGE
+    path = _cache_path(coin, chain, vs_currency, start, end)
+    if cacheable and not force_refresh:
+        data = _read_cache(path)
+        if data is not None:
+            return data
+
+    if address == "":
+        coin_id = symbol
+    else:
+        coin_id = await _coin_id_from_address(address, chain, semaphore=semaphore)
+
+    data = await get_prices(coin_id, vs_currency, start, end, semaphore=semaphore)
+    if cacheable:
+        _write_cache(data, path)
+
+    return data
+
+
+async def _pool_prices(  # pylint: disable=too-many-arguments
+    addresses, symbols, vs_currency, days, chain, end=None, force_refresh=False
+):
     if end is not None:
         # Times to reindex to: daily intervals
         # Coingecko only allows daily data when more than 90 days in the past
@@ -68,11 +163,16 @@ async def _pool_prices(coins, vs_currency, days, end=None):
         t_samples = pd.date_range(start=t_start, end=t_end, freq="60T", tz=timezone.utc)
         end = t_end.timestamp()
 
-    # Fetch data
+    # Fetch data: each coin's ID lookup and price request run back-to-back,
+    # concurrently with the other coins
+    semaphore = asyncio.Semaphore(MAX_CONCURRENT_REQUESTS)
+    start = t_start.timestamp() - 86400 * 3
     tasks = []
-    for coin in coins:
-        start = t_start.timestamp() - 86400 * 3
-        tasks.append(get_prices(coin, vs_currency, start, end))
+    for address, symbol in zip(addresses, symbols):
+        task = _get_coin_prices(
+            address, symbol, chain, vs_currency, start, end, semaphore, force_refresh
+        )
+        tasks.append(task)
 
     data = await asyncio.gather(*tasks)
 
@@ -93,12 +193,23 @@ async def _pool_prices(coins, vs_currency, days, end=None):
 
 
 def pool_prices(
-        addresses, symbols, vs_currency, days, chain="mainnet", end=None
+    addresses,
+    symbols,
+    vs_currency,
+    days,
+    chain="mainnet",
+    end=None,
+    force_refresh=False,
 ):
     """
     Pull price and volume data for given coins, quoted in given
     quote currency for given days.
 
+    Data for time ranges ending at least a day ago is cached on disk in
+    `CACHE_DIR` for 30 days.  Only calls for the identical range (same
+    coins, `days`, and `end`) hit the cache; overlapping ranges are
+    fetched in full.  With `end=None`, the range moves forward daily.
+
     Parameters
     ----------
     addresses: list of str
@@ -109,6 +220,8 @@ def pool_prices(
         Symbol for quote currency.
     days: int
         Number of days to pull data for.
+    force_refresh: bool, default=False
+        Fetch from the network even if cached data is available.
 
     Returns
     -------
@@ -116,20 +229,12 @@ def pool_prices(
         prices Series and volumes Series
     """
     # Get data
-    addresses_only = [addr for addr in addresses if addr != ""]
-    ids_from_addresses = coin_ids_from_addresses_sync(addresses_only, chain)
-    coins = []
-    j = 0
-    for i, addr in enumerate(addresses):
-        if addr == "":
-            coins.append(symbols[i])
-        else:
-            coins.append(ids_from_addresses[j])
-            j += 1
-    qprices, qvolumes = _pool_prices_sync(coins, vs_currency, days, end)
+    qprices, qvolumes = _pool_prices_sync(
+        addresses, symbols, vs_currency, days, chain, end, force_refresh
+    )
 
     # Compute prices by coin pairs
-    combos = get_pairs(len(coins))
+    combos = get_pairs(len(addresses))
     prices = []
     volumes = []
 
@@ -151,12 +256,12 @@ def pool_prices(
     return prices, volumes
 
 
-async def _coin_id_from_address(address, chain):
+async def _coin_id_from_address(address, chain, semaphore=None):
     address = address.lower()
     chain = PLATFORMS[chain.lower()]
     url = URL + f"coins/{chain}/contract/{address}"
 
-    r = await HTTP.get(url)
+    r = await _get(url, semaphore=semaphore)
     coin_id = r["id"]
     return coin_id
 
@@ -166,9 +271,10 @@ async def coin_ids_from_addresses(addresses, chain):
         coin_ids = await _coin_id_from_address(addresses, chain)
 
     else:
+        semaphore = asyncio.Semaphore(MAX_CONCURRENT_REQUESTS)
         tasks = []
         for addr in addresses:
-            tasks.append(_coin_id_from_address(addr, chain))
+            tasks.append(_coin_id_from_address(addr, chain, semaphore=semaphore))
 
         coin_ids = await asyncio.gather(*tasks)
 
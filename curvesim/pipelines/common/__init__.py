@@ -45,14 +45,19 @@ def get_arb_trades(pool, prices):
     """
 
     def post_trade_price_error(dx, coin_in, coin_out, price_target):
-        with pool.use_snapshot_context():
+        try:
             dx = int(dx)
             if dx > 0:
                 pool.trade(coin_in, coin_out, dx)
             price = pool.price(coin_in, coin_out, use_fee=True)
+        finally:
+            pool.revert_to_snapshot(snapshot)
 
         return price - price_target
 
+    # All evaluations revert to one pre-trade snapshot
+    snapshot = pool.get_snapshot()
+
     trades = []
 
     for pair in prices:
@@ -1,6 +1,6 @@
 from pprint import pformat
 
-from numpy import isnan
+from numpy import absolute, array, finfo, isnan, maximum, where, zeros
 from scipy.optimize import least_squares
 
 from curvesim.logging import get_logger
@@ -83,24 +83,28 @@ def multipair_optimal_arbitrage(  # noqa: C901  pylint: disable=too-many-locals
     input_trades = _sort_trades_by_size(input_trades)
     least_squares_inputs = _make_least_squares_inputs(input_trades, limits)
 
-    def post_trade_price_error_multi(amounts_in, price_targets, coin_pairs):
-        with pool.use_snapshot_context():
-            for coin_pair, amount_in in zip(coin_pairs, amounts_in):
-                if isnan(amount_in):
-                    dx = 0
-                else:
-                    dx = int(amount_in)
-
-                min_size = pool.get_min_trade_size(coin_pair[0])
-                if dx > min_size:
-                    pool.trade(*coin_pair, dx)
-
-            errors = []
-            for coin_pair, price_target in zip(coin_pairs, price_targets):
-                price = pool.price(*coin_pair, use_fee=True)
-                errors.append(price - price_target)
+    bounds = least_squares_inputs["bounds"]
+    last_eval = {}
 
-        return errors
+    def post_trade_price_error_multi(amounts_in, price_targets, coin_pairs):
+        # Amounts that round to the same trade sizes give the same errors, and
+        # least_squares asks for the Jacobian at the point it just evaluated
+        trade_sizes = _get_trade_sizes(pool, amounts_in, coin_pairs)
+        if last_eval.get("trade_sizes") != trade_sizes:
+            with pool.use_snapshot_context():
+                errors = _post_trade_price_errors(
+                    pool, trade_sizes, price_targets, coin_pairs
+                )
+
+            last_eval.update(trade_sizes=trade_sizes, errors=errors)
+
+        return last_eval["errors"]
+
+    def post_trade_price_error_jac(amounts_in, price_targets, coin_pairs):
+        errors = post_trade_price_error_multi(amounts_in, price_targets, coin_pairs)
+        return _post_trade_price_error_jac(
+            pool, amounts_in, price_targets, coin_pairs, bounds, errors
+        )
 
     # Find trades that minimize difference between
     # pool price and external market price
@@ -108,6 +112,7 @@ def multipair_optimal_arbitrage(  # noqa: C901  pylint: disable=too-many-locals
     try:
         res = least_squares(
             post_trade_price_error_multi,
+            jac=post_trade_price_error_jac,
             **least_squares_inputs,
             gtol=10**-15,
             xtol=10**-15,
@@ -133,6 +138,123 @@ def multipair_optimal_arbitrage(  # noqa: C901  pylint: disable=too-many-locals
     return trades, price_errors, res
 
 
+def _post_trade_price_errors(pool, trade_sizes, price_targets, coin_pairs):
+    """
+    Applies the trades to the pool and returns the post-trade price errors.
+
+    The caller is responsible for snapshotting and reverting the pool.
+    """
+    for coin_pair, dx in zip(coin_pairs, trade_sizes):
+        if dx:
+            pool.trade(*coin_pair, dx)
+
+    return _get_price_errors(pool, price_targets, coin_pairs)
+
+
+def _post_trade_price_error_jac(  # pylint: disable=too-many-arguments
+    pool, amounts_in, price_targets, coin_pairs, bounds, errors
+):
+    """
+    Returns the forward-difference Jacobian of the post-trade price errors.
+
+    This is the Jacobian of scipy's "2-point" scheme, with `errors` (the
+    price errors at `amounts_in`) as the base point.  The trades are
+    applied in sequence, so every perturbed trade vector is replayed in
+    full from the pre-trade pool state.  Columns whose step does not change
+    the integer trade sizes are zero and are not replayed.
+
+    Like scipy's `approx_derivative`, the Jacobian is built transposed and
+    returned as a column-major view, so the solver's linear algebra (and
+    its rounding) is the same as with `jac="2-point"`.
+    """
+    x0 = array(amounts_in, dtype=float)
+    f0 = array(errors)
+    steps = _get_fd_steps(x0, bounds)
+    trade_sizes0 = _get_trade_sizes(pool, x0, coin_pairs)
+    jac_t = zeros((len(x0), len(f0)))
+
+    with pool.use_snapshot_context() as snapshot:
+        for k, step in enumerate(steps):
+            x = x0.copy()
+            x[k] += step
+            step = x[k] - x0[k]
+
+            trade_sizes = _get_trade_sizes(pool, x, coin_pairs)
+            if trade_sizes == trade_sizes0:
+                continue
+
+            f = _post_trade_price_errors(pool, trade_sizes, price_targets, coin_pairs)
+            jac_t[k] = (array(f) - f0) / step
+            pool.revert_to_snapshot(snapshot)
+
+    return jac_t.T
+
+
+def _get_fd_steps(x0, bounds):
+    """
+    Returns the finite-difference steps of scipy's "2-point" scheme.
+
+    The relative step is sqrt(eps).  A step that would leave the bounds is
+    reversed; if it fits in neither direction, it is cut to the distance to
+    the farther bound.
+
+    This mirrors the private `scipy.optimize._numdiff` functions
+    `_compute_absolute_step` and `_adjust_scheme_to_bounds` (with the
+    "1-sided" scheme), and `test_get_fd_steps` pins it to them.
+    """
+    low, high = (array(bound, dtype=float) for bound in bounds)
+    sign_x0 = where(x0 >= 0, 1.0, -1.0)
+    steps = finfo(float).eps ** 0.5 * sign_x0 * maximum(1.0, absolute(x0))
+
+    lower_dist = x0 - low
+    upper_dist = high - x0
+    x = x0 + steps
+    violated = (x < low) | (x > high)
+    fitting = absolute(steps) <= maximum(lower_dist, upper_dist)
+    steps[violated & fitting] *= -1
+
+    forward = (upper_dist >= lower_dist) & ~fitting
+    steps[forward] = upper_dist[forward]
+    backward = (upper_dist < lower_dist) & ~fitting
+    steps[backward] = -lower_dist[backward]
+
+    return steps
+
+
+def _get_trade_sizes(pool, amounts_in, coin_pairs):
+    """Returns the integer trade sizes for the optimizer amounts."""
+    trade_sizes = []
+    for coin_pair, amount_in in zip(coin_pairs, amounts_in):
+        trade_sizes.append(_get_trade_size(pool, coin_pair[0], amount_in))
+
+    return tuple(trade_sizes)
+
+
+def _get_trade_size(pool, coin_in, amount_in):
+    """
+    Returns the integer trade size for an optimizer amount, or 0 if the
+    amount is NaN or does not exceed the pool's minimum trade size.
+    """
+    if isnan(amount_in):
+        return 0
+
+    dx = int(amount_in)
+    if dx > pool.get_min_trade_size(coin_in):
+        return dx
+
+    return 0
+
+
+def _get_price_errors(pool, price_targets, coin_pairs):
+    """Returns the difference between pool prices and price targets."""
+    errors = []
+    for coin_pair, price_target in zip(coin_pairs, price_targets):
+        price = pool.price(*coin_pair, use_fee=True)
+        errors.append(price - price_target)
+
+    return errors
+
+
 def _apply_volume_limits(arb_trades, limits, pool):
     """
     Returns list of ArbTrades with amount_in set to min(limit, amount_in). Any trades
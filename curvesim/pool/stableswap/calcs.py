@@ -0,0 +1,229 @@
+"""
+Pure stableswap calculations shared by the pool implementations.
+
+These are the hot kernels of every simulation (every `price`, `trade`,
+and `dydx` runs at least one of them), so they take plain arguments
+and keep pool state out of the loops.
+"""
+__all__ = [
+    "get_D",
+    "get_y",
+    "get_y_D",
+    "get_dydx",
+]
+
+from functools import lru_cache
+from math import prod
+from typing import List
+
+from gmpy2 import mpz
+
+# Number of (xp, A) invariants to remember; prices and trades at a given
+# pool state all solve for the same `D`.
+D_CACHE_SIZE = 256
+
+
+def get_D(xp: List[int], A: int) -> int:
+    r"""
+    Calculate D invariant iteratively using non-overflowing integer operations.
+
+    Stableswap equation:
+
+    .. math::
+         A n^n \sum{x_i} + D = A n^n D + D^{n+1} / (n^n \prod{x_i})
+
+    Converging solution using Newton's method:
+
+    .. math::
+         d_{j+1} = (A n^n \sum{x_i} + n d_j^{n+1} / (n^n \prod{x_i}))
+                 / (A n^n + (n+1) d_j^n/(n^n \prod{x_i}) - 1)
+
+    Replace :math:`A n^n` by `An` and :math:`d_j^{n+1}/(n^n \prod{x_i})` by
+    :math:`D_p` to arrive at the iterative formula in the code.
+
+    Parameters
+    ----------
+    xp: list of ints
+        Coin balances in units of D
+    A: int
+        Amplification coefficient
+
+    Returns
+    -------
+    int
+        The stableswap invariant, `D`.
+
+    Note
+    ----
+    Results are memoized on `(xp, A)`, so repeated calls for an unchanged
+    pool state skip the Newton iteration.
+    """
+    return _get_D(tuple(xp), A)
+
+
+@lru_cache(maxsize=D_CACHE_SIZE)
+def _get_D(xp, A):
+    n = len(xp)
+    S = sum(xp)
+    Ann = mpz(A * n)
+    D = mpz(S)
+
+    # Loop invariants of the Newton step
+    nxp = [n * x for x in xp]
+    Ann_S = Ann * S
+    Ann_1 = Ann - 1
+    n_1 = n + 1
+
+    Dprev = 0
+    while abs(D - Dprev) > 1:
+        D_P = D
+        for nx in nxp:
+            D_P = D_P * D // nx
+        Dprev = D
+        D = (Ann_S + D_P * n) * D // (Ann_1 * D + n_1 * D_P)
+
+    return int(D)
+
+
+def get_y(i: int, j: int, x: int, xp: List[int], A: int, D: int) -> int:
+    r"""
+    Calculate x[j] if one makes x[i] = x.
+
+    The stableswap equation gives the following:
+
+    .. math::
+        x_1^2 + x_1 (\operatorname{sum'} - (A n^n - 1) D / (A n^n))
+           = D^{n+1}/(n^{2 n} \operatorname{prod'} A)
+
+    where :math:`\operatorname{sum'}` is the sum of all :math:`x_i` for
+    :math:`i \\neq j` and :math:`\operatorname{prod'}` is the product
+    of all :math:`x_i` for :math:`i \\neq j`.
+
+    This is a quadratic equation in :math:`x_j`.
+
+    .. math:: x_1^2 + b x_1 = c
+
+    which can then be solved iteratively by Newton's method:
+
+    .. math:: x_1 := (x_1^2 + c) / (2 x_1 + b)
+
+    Parameters
+    ----------
+    i: int
+        index of coin; usually the "in"-token
+    j: int
+        index of coin; usually the "out"-token
+    x: int
+        balance of i-th coin in units of D
+    xp: list of int
+        coin balances in units of D
+    A: int
+        Amplification coefficient
+    D: int
+        The stableswap invariant for `xp`
+
+    Returns
+    -------
+    int
+        The balance of the j-th coin, in units of D, for the other
+        coin balances given.
+    """
+    n = len(xp)
+    D = mpz(D)
+    xx = [x if k == i else xp[k] for k in range(n) if k != j]
+    Ann = A * n
+    c = D
+    for y in xx:
+        c = c * D // (y * n)
+    c = c * D // (n * Ann)
+    b = sum(xx) + D // Ann - D
+    y_prev = 0
+    # Adding to x[i] lowers x[j], so the current x[j] is, like D, above the
+    # root but much closer; Newton converges down to the same value
+    y = xp[j] if x >= xp[i] else D
+    while abs(y - y_prev) > 1:
+        y_prev = y
+        y = (y**2 + c) // (2 * y + b)
+
+    return int(y)
+
+
+def get_y_D(A: int, i: int, xp: List[int], D: int) -> int:
+    """
+    Calculate x[i] if one uses a reduced `D` than one calculated for given `xp`.
+
+    See docstring for `get_y`.
+
+    Parameters
+    ----------
+    A: int
+        Amplification coefficient for given xp and D
+    i: int
+        index of coin to calculate balance for
+    xp: list of int
+        coin balances in units of D
+    D: int
+        new invariant value
+
+    Returns
+    -------
+    int
+        The balance of the i-th coin, in units of D
+    """
+    n = len(xp)
+    D = mpz(D)
+    xx = [xp[k] for k in range(n) if k != i]
+    Ann = A * n
+    c = D
+    for y in xx:
+        c = c * D // (y * n)
+    c = c * D // (n * Ann)
+    b = sum(xx) + D // Ann - D
+    y_prev = 0
+    y = D
+    while abs(y - y_prev) > 1:
+        y_prev = y
+        y = (y**2 + c) // (2 * y + b)
+
+    return int(y)
+
+
+def get_dydx(i: int, j: int, xp: List[int], A: int, D: int) -> float:
+    r"""
+    Returns the spot price of i-th coin quoted in terms of j-th coin,
+    i.e. the ratio of output coin amount to input coin amount for
+    an "infinitesimally" small trade.  Fees are not deducted.
+
+    Differentiating the stableswap equation gives:
+
+    .. math::
+        \frac{dy}{dx} = \frac{x_j (x_i A n^{n+1} \prod{x_k} + D^{n+1})}
+                              {x_i (x_j A n^{n+1} \prod{x_k} + D^{n+1})}
+
+    The numerator and denominator are exact integers, and Python's integer
+    true division rounds their ratio correctly to the nearest float.
+
+    Parameters
+    ----------
+    i: int
+        index of coin to be priced; usually the "in"-token
+    j: int
+        index of quote currency; usually the "out"-token
+    xp: list of int
+        coin balances in units of D
+    A: int
+        Amplification coefficient
+    D: int
+        The stableswap invariant for `xp`
+
+    Returns
+    -------
+    float
+        Price of i-th coin quoted in j-th coin
+    """
+    n = len(xp)
+    xi = xp[i]
+    xj = xp[j]
+    D_pow = D ** (n + 1)
+    A_pow_prod = A * n ** (n + 1) * prod(xp)
+    return float((xj * (xi * A_pow_prod + D_pow)) / (xi * (xj * A_pow_prod + D_pow)))
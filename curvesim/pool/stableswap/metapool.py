@@ -10,6 +10,7 @@ from curvesim.exceptions import CurvesimValueError
 from curvesim.pool.snapshot import CurveMetaPoolBalanceSnapshot, Snapshot
 
 from ..base import Pool
+from .calcs import get_D, get_dydx, get_y, get_y_D
 
 
 class CurveMetaPool(Pool):  # pylint: disable=too-many-instance-attributes
@@ -180,21 +181,7 @@ class CurveMetaPool(Pool):  # pylint: disable=too-many-instance-attributes
         ----
         This is a "view" function; it doesn't change the state of the pool.
         """  # noqa
-        Dprev = 0
-        S = sum(xp)
-        D = S
-        Ann = A * self.n
-        D = mpz(D)
-        Ann = mpz(Ann)
-        while abs(D - Dprev) > 1:
-            D_P = D
-            for x in xp:
-                D_P = D_P * D // (self.n * x)
-            Dprev = D
-            D = (Ann * S + D_P * self.n) * D // ((Ann - 1) * D + (self.n + 1) * D_P)
-
-        D = int(D)
-        return D
+        return get_D(xp, A)
 
     def _xp(self):
         rates = self.rates
@@ -271,24 +258,8 @@ class CurveMetaPool(Pool):  # pylint: disable=too-many-instance-attributes
         ----
         This is a "view" function; it doesn't change the state of the pool.
         """  # noqa
-        xx = xp[:]
-        D = self.D(xx)
-        D = mpz(D)
-        xx[i] = x  # x is quantity of underlying asset brought to 1e18 precision
-        xx = [xx[k] for k in range(self.n) if k != j]
-        Ann = self.A * self.n
-        c = D
-        for y in xx:
-            c = c * D // (y * self.n)
-        c = c * D // (self.n * Ann)
-        b = sum(xx) + D // Ann - D
-        y_prev = 0
-        y = D
-        while abs(y - y_prev) > 1:
-            y_prev = y
-            y = (y**2 + c) // (2 * y + b)
-        y = int(y)
-        return y  # result is in units for D
+        D = self.D(xp)
+        return get_y(i, j, x, xp, self.A, D)
 
     def get_y_D(self, A, i, xp, D):
         """
@@ -316,22 +287,7 @@ class CurveMetaPool(Pool):  # pylint: disable=too-many-instance-attributes
         ----
         This is a "view" function; it doesn't change the state of the pool.
         """
-        D = mpz(D)
-        xx = [xp[k] for k in range(self.n) if k != i]
-        S = sum(xx)
-        Ann = A * self.n
-        c = D
-        for y in xx:
-            c = c * D // (y * self.n)
-        c = c * D // (self.n * Ann)
-        b = S + D // Ann
-        y_prev = 0
-        y = D
-        while abs(y - y_prev) > 1:
-            y_prev = y
-            y = (y**2 + c) // (2 * y + b - D)
-        y = int(y)
-        return y  # result is in units for D
+        return get_y_D(A, i, xp, D)
 
     def exchange(self, i, j, dx):
         """
@@ -503,7 +459,7 @@ class CurveMetaPool(Pool):  # pylint: disable=too-many-instance-attributes
         new_y = self.get_y_D(A, i, xp, D1)
         dy_before_fee = (xp[i] - new_y) * 10**18 // rates[i]
 
-        xp_reduced = xp
+        xp_reduced = xp.copy()
         if self.fee and use_fee:
             n_coins = self.n
             _fee = self.fee * n_coins // (4 * (n_coins - 1))
@@ -516,7 +472,7 @@ class CurveMetaPool(Pool):  # pylint: disable=too-many-instance-attributes
                     dx_expected = xp[j] - xp[j] * D1 // D0
                 xp_reduced[j] -= _fee * dx_expected // 10**10
 
-        dy = xp[i] - self.get_y_D(A, i, xp_reduced, D1)
+        dy = xp_reduced[i] - self.get_y_D(A, i, xp_reduced, D1)
         dy = (dy - 1) * 10**18 // rates[i]
 
         if use_fee:
@@ -858,15 +814,8 @@ class CurveMetaPool(Pool):  # pylint: disable=too-many-instance-attributes
         """
         xi = xp[i]
         xj = xp[j]
-        n = self.n
-        A = self.A
         D = self.D(xp)
-        D_pow = mpz(D) ** (n + 1)
-        x_prod = prod(xp)
-        A_pow = A * n ** (n + 1)
-        dydx = (xj * (xi * A_pow * x_prod + D_pow)) / (
-            xi * (xj * A_pow * x_prod + D_pow)
-        )
+        dydx = get_dydx(i, j, xp, self.A, D)
 
         if use_fee:
             if self.fee_mul is None:
@@ -1,15 +1,13 @@
 """
 Mainly a module to house the `Pool`, a basic stableswap implementation in Python.
 """
-from math import prod
 from typing import Type
 
-from gmpy2 import mpz
-
 from curvesim.exceptions import CurvesimValueError
 from curvesim.pool.snapshot import CurvePoolBalanceSnapshot, Snapshot
 
 from ..base import Pool
+from .calcs import get_D, get_dydx, get_y, get_y_D
 
 
 class CurvePool(Pool):  # pylint: disable=too-many-instance-attributes
@@ -173,22 +171,7 @@ class CurvePool(Pool):  # pylint: disable=too-many-instance-attributes
         ----
         This is a "view" function; it doesn't change the state of the pool.
         """  # noqa
-        Dprev = 0
-        S = sum(xp)
-        D = S
-        n = self.n
-        Ann = A * n
-        D = mpz(D)
-        Ann = mpz(Ann)
-        while abs(D - Dprev) > 1:
-            D_P = D
-            for x in xp:
-                D_P = D_P * D // (n * x)
-            Dprev = D
-            D = (Ann * S + D_P * n) * D // ((Ann - 1) * D + (n + 1) * D_P)
-
-        D = int(D)
-        return D
+        return get_D(xp, A)
 
     def get_D_mem(self, balances, A):
         """
@@ -257,25 +240,8 @@ class CurvePool(Pool):  # pylint: disable=too-many-instance-attributes
         ----
         This is a "view" function; it doesn't change the state of the pool.
         """  # noqa
-        xx = xp[:]
-        D = self.D(xx)
-        D = mpz(D)
-        xx[i] = x  # x is quantity of underlying asset brought to 1e18 precision
-        n = self.n
-        xx = [xx[k] for k in range(n) if k != j]
-        Ann = self.A * n
-        c = D
-        for y in xx:
-            c = c * D // (y * n)
-        c = c * D // (n * Ann)
-        b = sum(xx) + D // Ann - D
-        y_prev = 0
-        y = D
-        while abs(y - y_prev) > 1:
-            y_prev = y
-            y = (y**2 + c) // (2 * y + b)
-        y = int(y)
-        return y  # result is in units for D
+        D = self.D(xp)
+        return get_y(i, j, x, xp, self.A, D)
 
     def get_y_D(self, A, i, xp, D):
         """
@@ -303,23 +269,7 @@ class CurvePool(Pool):  # pylint: disable=too-many-instance-attributes
         ----
         This is a "view" function; it doesn't change the state of the pool.
         """
-        D = mpz(D)
-        n = self.n
-        xx = [xp[k] for k in range(n) if k != i]
-        S = sum(xx)
-        Ann = A * n
-        c = D
-        for y in xx:
-            c = c * D // (y * n)
-        c = c * D // (n * Ann)
-        b = S + D // Ann
-        y_prev = 0
-        y = D
-        while abs(y - y_prev) > 1:
-            y_prev = y
-            y = (y**2 + c) // (2 * y + b - D)
-        y = int(y)
-        return y  # result is in units for D
+        return get_y_D(A, i, xp, D)
 
     def exchange(self, i, j, dx):
         """
@@ -406,7 +356,7 @@ class CurvePool(Pool):  # pylint: disable=too-many-instance-attributes
         new_y = self.get_y_D(A, i, xp, D1)
         dy_before_fee = (xp[i] - new_y) * 10**18 // self.rates[i]
 
-        xp_reduced = xp
+        xp_reduced = xp.copy()
         if self.fee and use_fee:
             n_coins = self.n
             _fee = self.fee * n_coins // (4 * (n_coins - 1))
@@ -419,7 +369,7 @@ class CurvePool(Pool):  # pylint: disable=too-many-instance-attributes
                     dx_expected = xp[j] - xp[j] * D1 // D0
                 xp_reduced[j] -= _fee * dx_expected // 10**10
 
-        dy = xp[i] - self.get_y_D(A, i, xp_reduced, D1)
+        dy = xp_reduced[i] - self.get_y_D(A, i, xp_reduced, D1)
         dy = (dy - 1) * 10**18 // self.rates[i]
 
         if use_fee:
@@ -700,15 +650,8 @@ class CurvePool(Pool):  # pylint: disable=too-many-instance-attributes
     def _dydx(self, i, j, xp, use_fee):
         xi = xp[i]
         xj = xp[j]
-        n = self.n
-        A = self.A
         D = self.D(xp)
-        D_pow = mpz(D) ** (n + 1)
-        x_prod = prod(xp)
-        A_pow = A * n ** (n + 1)
-        dydx = (xj * (xi * A_pow * x_prod + D_pow)) / (
-            xi * (xj * A_pow * x_prod + D_pow)
-        )
+        dydx = get_dydx(i, j, xp, self.A, D)
 
         if use_fee:
             if self.fee_mul is None:
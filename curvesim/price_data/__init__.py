@@ -21,6 +21,7 @@ def get(
     data_dir="data",
     src="coingecko",
     end=None,
+    force_refresh=False,
 ):
     """
     Pull price and volume data for given coins.
@@ -45,6 +46,9 @@ def get(
     src : str, default="coingecko"
         Data source ("coingecko", "nomics", or "local").
 
+    force_refresh : bool, default=False
+        Ignore cached Coingecko data and fetch it again.
+
 
     Returns
     -------
@@ -60,7 +64,12 @@ def get(
     """
     if src == "coingecko":
         prices, volumes, pzero = coingecko(
-            addresses, symbols, chain=chain, days=days, end=end
+            addresses,
+            symbols,
+            chain=chain,
+            days=days,
+            end=end,
+            force_refresh=force_refresh,
         )
 
     elif src == "nomics":
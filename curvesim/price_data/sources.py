@@ -8,7 +8,9 @@ from curvesim.network import coingecko as _coingecko
 logger = get_logger(__name__)
 
 
-def coingecko(addresses, symbols, chain="mainnet", days=60, end=None):
+def coingecko(
+    addresses, symbols, chain="mainnet", days=60, end=None, force_refresh=False
+):
     """
     Fetch CoinGecko price data for specified coins.
 
@@ -25,6 +27,9 @@ def coingecko(addresses, symbols, chain="mainnet", days=60, end=None):
     end : int, optional
         End timestamp for the data in seconds since epoch.
         If None, the end time will be the current time. Default is None.
+    force_refresh : bool, optional
+        Fetch from CoinGecko even if the data is cached on disk.
+        Default is False.
 
     Returns
     -------
@@ -33,7 +38,13 @@ def coingecko(addresses, symbols, chain="mainnet", days=60, end=None):
     """
     logger.info("Fetching CoinGecko price data...")
     prices, volumes = _coingecko.pool_prices(
-        addresses, symbols, "usd", days, chain=chain, end=end
+        addresses,
+        symbols,
+        "usd",
+        days,
+        chain=chain,
+        end=end,
+        force_refresh=force_refresh,
     )
     pzero = 0
 
@@ -0,0 +1,167 @@
+import asyncio
+import os
+from datetime import datetime, timedelta, timezone
+
+import pytest
+
+from curvesim.network import coingecko
+
+ADDRESSES = [
+    "0x6B175474E89094C44Da98b954EedeAC495271d0F",
+    "0xA0b86991c6218b36c1d19D4a2e9Eb0cE3606eB48",
+]
+SYMBOLS = ["DAI", "USDC"]
+
+
+def make_fake_get(requests):
+    async def fake_get(url, params=None):
+        requests.append(url)
+        if "contract" in url:
+            return {"id": url.rsplit("/", 1)[-1]}
+
+        start = int(params["from"] * 1000)
+        end = int(params["to"] * 1000)
+        timestamps = range(start, end, 3600 * 1000)
+        return {
+            "prices": [[t, 1.0] for t in timestamps],
+            "total_volumes": [[t, 10**6] for t in timestamps],
+        }
+
+    return fake_get
+
+
+def test_pool_prices_cache(monkeypatch, tmp_path):
+    requests = []
+    monkeypatch.setattr(coingecko, "CACHE_DIR", str(tmp_path))
+    monkeypatch.setattr(coingecko.HTTP, "get", make_fake_get(requests))
+
+    end = datetime.now(timezone.utc) - timedelta(days=1)
+    end = int(end.timestamp())
+
+    prices, volumes = coingecko.pool_prices(ADDRESSES, SYMBOLS, "usd", 3, end=end)
+    assert len(requests) == 4  # ID lookup and price request per coin
+
+    # Past date ranges are served from the cache
+    cached_prices, cached_volumes = coingecko.pool_prices(
+        ADDRESSES, SYMBOLS, "usd", 3, end=end
+    )
+    assert len(requests) == 4
+    assert cached_prices.equals(prices)
+    assert cached_volumes.equals(volumes)
+
+    coingecko.pool_prices(ADDRESSES, SYMBOLS, "usd", 3, end=end, force_refresh=True)
+    assert len(requests) == 8
+
+    # A new date range is fetched from the network
+    coingecko.pool_prices(ADDRESSES, SYMBOLS, "usd", 2, end=end)
+    assert len(requests) == 12
+
+
+@pytest.mark.parametrize("offset", [timedelta(days=1), timedelta(hours=-2)])
+def test_pool_prices_no_cache_for_recent_end(monkeypatch, tmp_path, offset):
+    requests = []
+    monkeypatch.setattr(coingecko, "CACHE_DIR", str(tmp_path))
+    monkeypatch.setattr(coingecko.HTTP, "get", make_fake_get(requests))
+
+    # CoinGecko may still revise data from the last day
+    end = datetime.now(timezone.utc) + offset
+    end = int(end.timestamp())
+
+    for _ in range(2):
+        coingecko.pool_prices(ADDRESSES, SYMBOLS, "usd", 3, end=end)
+
+    assert len(requests) == 8
+    assert not list(tmp_path.iterdir())
+
+
+def test_pool_prices_unreadable_cache(monkeypatch, tmp_path):
+    requests = []
+    monkeypatch.setattr(coingecko, "CACHE_DIR", str(tmp_path))
+    monkeypatch.setattr(coingecko.HTTP, "get", make_fake_get(requests))
+
+    end = datetime.now(timezone.utc) - timedelta(days=1)
+    end = int(end.timestamp())
+
+    prices, volumes = coingecko.pool_prices(ADDRESSES, SYMBOLS, "usd", 3, end=end)
+    for path in tmp_path.iterdir():
+        path.write_bytes(b"not a pickle")
+
+    # Unreadable cache files are refetched and rewritten
+    refetched_prices, refetched_volumes = coingecko.pool_prices(
+        ADDRESSES, SYMBOLS, "usd", 3, end=end
+    )
+    assert len(requests) == 8
+    assert refetched_prices.equals(prices)
+    assert refetched_volumes.equals(volumes)
+
+    coingecko.pool_prices(ADDRESSES, SYMBOLS, "usd", 3, end=end)
+    assert len(requests) == 8
+
+
+def test_pool_prices_unwritable_cache(monkeypatch, tmp_path):
+    requests = []
+    blocker = tmp_path / "blocker"
+    blocker.write_text("")
+    monkeypatch.setattr(coingecko, "CACHE_DIR", str(blocker / "coingecko"))
+    monkeypatch.setattr(coingecko.HTTP, "get", make_fake_get(requests))
+
+    end = datetime.now(timezone.utc) - timedelta(days=1)
+    end = int(end.timestamp())
+
+    # Data is still returned when the cache directory cannot be created
+    prices, _ = coingecko.pool_prices(ADDRESSES, SYMBOLS, "usd", 3, end=end)
+    assert len(requests) == 4
+    assert not prices.empty
+    assert list(tmp_path.iterdir()) == [blocker]
+
+
+def test_pool_prices_cache_pruning(monkeypatch, tmp_path):
+    requests = []
+    monkeypatch.setattr(coingecko, "CACHE_DIR", str(tmp_path))
+    monkeypatch.setattr(coingecko.HTTP, "get", make_fake_get(requests))
+
+    end = datetime.now(timezone.utc) - timedelta(days=2)
+    end = int(end.timestamp())
+
+    coingecko.pool_prices(ADDRESSES, SYMBOLS, "usd", 3, end=end)
+    old_files = set(tmp_path.iterdir())
+    assert len(old_files) == 2
+
+    expired = datetime.now(timezone.utc).timestamp() - coingecko.CACHE_MAX_AGE - 1
+    for path in old_files:
+        os.utime(path, (expired, expired))
+
+    # Writing new cache files removes expired ones
+    coingecko.pool_prices(ADDRESSES, SYMBOLS, "usd", 3, end=end - 86400)
+    new_files = set(tmp_path.iterdir())
+    assert len(new_files) == 2
+    assert not old_files & new_files
+
+
+def test_pool_prices_concurrency(monkeypatch, tmp_path):
+    requests = []
+    in_flight = 0
+    peak = 0
+    fake_get = make_fake_get(requests)
+
+    async def counting_get(url, params=None):
+        nonlocal in_flight, peak
+        in_flight += 1
+        peak = max(peak, in_flight)
+        await asyncio.sleep(0.001)
+        in_flight -= 1
+        return await fake_get(url, params=params)
+
+    monkeypatch.setattr(coingecko, "CACHE_DIR", str(tmp_path))
+    monkeypatch.setattr(coingecko.HTTP, "get", counting_get)
+
+    end = datetime.now(timezone.utc) - timedelta(days=2)
+    end = int(end.timestamp())
+
+    addresses = [f"0x{i:040x}" for i in range(25)]
+    symbols = [f"SYM{i}" for i in range(25)]
+    coingecko.pool_prices(addresses, symbols, "usd", 3, end=end)
+
+    # Requests overlap, up to the limit and no further
+    assert len(requests) == 50
+    assert peak == coingecko.MAX_CONCURRENT_REQUESTS
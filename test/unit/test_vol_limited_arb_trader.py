@@ -1,8 +1,17 @@
+import numpy as np
+import pytest
 from hypothesis import HealthCheck, given, settings
 from hypothesis import strategies as st
+from scipy.optimize import _numdiff, least_squares
 
-from curvesim.pipelines.vol_limited_arb.trader import _apply_volume_limits
+from curvesim.pipelines.vol_limited_arb import trader
+from curvesim.pipelines.vol_limited_arb.trader import (
+    _apply_volume_limits,
+    _get_fd_steps,
+    multipair_optimal_arbitrage,
+)
 from curvesim.templates.trader import ArbTrade
+from curvesim.utils import get_pairs
 
 
 class DummyPool:
@@ -39,3 +48,87 @@ def test_apply_volume_limits(trade_sizes, min_trade_sizes, volume_limits):
 
     for trade in excluded_trades:
         assert trade.amount_in <= pool.get_min_trade_size(trade.coin_in)
+
+
+@pytest.mark.parametrize("price_shift", [0.995, 1.01, 1.03])
+@pytest.mark.parametrize("volume_share", [0.05, 0.5])
+@pytest.mark.parametrize(
+    "pool_fixture", ["sim_curve_pool", "sim_curve_tripool", "sim_curve_meta_pool"]
+)
+def test_multipair_optimal_arbitrage(
+    request, monkeypatch, pool_fixture, price_shift, volume_share
+):
+    """
+    Test optimized trades against a least_squares solve that estimates
+    the Jacobian with scipy's "2-point" scheme.
+    """
+    pool = request.getfixturevalue(pool_fixture)
+    coin_names = _set_coin_names(pool)
+
+    pairs = get_pairs(coin_names)
+    balances = pool.asset_balances
+    prices = {}
+    limits = {}
+    for k, (coin_in, coin_out) in enumerate(pairs):
+        price = pool.price(coin_in, coin_out, use_fee=False)
+        prices[(coin_in, coin_out)] = price * price_shift ** (-1) ** k
+        limits[(coin_in, coin_out)] = int(balances[coin_in] * volume_share)
+        limits[(coin_out, coin_in)] = int(balances[coin_out] * volume_share)
+
+    trades, errors, res = multipair_optimal_arbitrage(pool, prices, limits)
+
+    def least_squares_2_point(
+        fun, jac=None, **kwargs
+    ):  # pylint: disable=unused-argument
+        return least_squares(fun, jac="2-point", **kwargs)
+
+    monkeypatch.setattr(trader, "least_squares", least_squares_2_point)
+    expected_trades, expected_errors, expected_res = multipair_optimal_arbitrage(
+        pool, prices, limits
+    )
+
+    assert res.cost == pytest.approx(expected_res.cost, rel=1e-6, abs=1e-15)
+    assert errors == pytest.approx(expected_errors, rel=1e-6, abs=1e-9)
+
+    amounts = {(t.coin_in, t.coin_out): t.amount_in for t in trades}
+    expected_amounts = {(t.coin_in, t.coin_out): t.amount_in for t in expected_trades}
+    assert amounts.keys() == expected_amounts.keys()
+    for pair, amount in expected_amounts.items():
+        assert amounts[pair] == pytest.approx(amount, rel=1e-6)
+
+
+@pytest.mark.parametrize("high", [1.0, 10**6, 10**24])
+@pytest.mark.parametrize("position", [0, 1e-12, 1e-6, 0.5, 1 - 1e-6, 1 - 1e-12, 1])
+def test_get_fd_steps(position, high):
+    """
+    Test finite-difference steps against the scipy internals they mirror:
+    `_compute_absolute_step` and the "1-sided" `_adjust_scheme_to_bounds`.
+    """
+    # The last two ranges are narrower than the step is long in one or
+    # both directions
+    low = [0.0, 0.0, high * (1 - 1e-7), high * (1 - 1e-9)]
+    high = [high, high * 2, high, high]
+    x0 = np.array([lo + position * (hi - lo) for lo, hi in zip(low, high)])
+
+    steps = _get_fd_steps(x0, (low, high))
+
+    f0 = np.zeros(2)
+    expected_steps = _numdiff._compute_absolute_step(None, x0, f0, "2-point")
+    expected_steps, _ = _numdiff._adjust_scheme_to_bounds(
+        x0, expected_steps, 1, "1-sided", np.array(low), np.array(high)
+    )
+    np.testing.assert_array_equal(steps, expected_steps)
+
+
+def _set_coin_names(pool):
+    """Names the pool's coins and returns the names of the tradable coins."""
+    coin_names = ["SYM" + str(i) for i in range(pool.n)]
+    pool.metadata = {"coins": {"names": coin_names}}
+
+    if not hasattr(pool, "basepool"):
+        return coin_names
+
+    # Metapools trade the basepool's coins in place of its LP token
+    bp_coin_names = ["BP_SYM" + str(i) for i in range(pool.basepool.n)]
+    pool.basepool.metadata = {"coins": {"names": bp_coin_names}}
+    return coin_names[:-1] + bp_coin_names